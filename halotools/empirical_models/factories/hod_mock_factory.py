@@ -336,15 +336,20 @@ class HodMockFactory(MockFactory):
             # For the gal_type_slice indices of
             # the pre-allocated array self.gal_type,
             # set each string-type entry equal to the gal_type string
-            self.galaxy_table["gal_type"][gal_type_slice] = np.repeat(
-                gal_type, self._total_abundance[gal_type], axis=0
+            self.galaxy_table["gal_type"][gal_type_slice] = gal_type
+
+            # Index of the host halo of each gal_type galaxy. Computing this once
+            # lets every host halo property be broadcast with a single gather,
+            # rather than repeating the occupation counts for each column
+            host_halo_indices = np.repeat(
+                np.arange(len(self.halo_table)), self._occupation[gal_type]
             )
 
             # Store all other relevant host halo properties into their
             # appropriate pre-allocated array
             for halocatkey in self.additional_haloprops:
-                self.galaxy_table[halocatkey][gal_type_slice] = np.repeat(
-                    self.halo_table[halocatkey], self._occupation[gal_type], axis=0
+                self.galaxy_table[halocatkey][gal_type_slice] = np.take(
+                    self.halo_table[halocatkey], host_halo_indices, axis=0
                 )
 
         self.galaxy_table["x"] = self.galaxy_table["halo_x"]
@@ -259,12 +259,15 @@ def call_func_table(func_table, abscissa, func_indices):
     func_indices = np.atleast_1d(func_indices)
 
     func_argsort = func_indices.argsort()
-    func_ranges = list(np.searchsorted(func_indices[func_argsort], list(range(len(func_table)))))
+    # Only visit the functions that are actually requested, rather than every
+    # entry of a potentially very large lookup table
+    used_indices, func_ranges = np.unique(func_indices[func_argsort], return_index=True)
+    func_ranges = list(func_ranges)
     func_ranges.append(None)
     out = np.zeros_like(abscissa)
-    for f, start, end in zip(func_table, func_ranges[:-1], func_ranges[1:]):
+    for ifunc, start, end in zip(used_indices, func_ranges[:-1], func_ranges[1:]):
         ix = func_argsort[start:end]
-        out[ix] = f(abscissa[ix])
+        out[ix] = func_table[int(ifunc)](abscissa[ix])
     return out
 
 
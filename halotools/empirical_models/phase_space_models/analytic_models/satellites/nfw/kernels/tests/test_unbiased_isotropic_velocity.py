@@ -4,6 +4,7 @@ import numpy as np
 from astropy.utils.data import get_pkg_data_filename
 
 from ..unbiased_isotropic_velocity import dimensionless_radial_velocity_dispersion as unbiased_dimless_vel_rad_disp
+from ..unbiased_isotropic_velocity import _jeans_integral
 
 
 __all__ = ('test_unbiased_vel_rad_disp1', )
@@ -31,3 +32,26 @@ def test_unbiased_vel_rad_disp_external_c10():
     frank_dimless_sigma_rad = x[:, 2]
     aph_dimless_sigma_rad = unbiased_dimless_vel_rad_disp(frank_r_by_Rvir, 10)
     assert np.allclose(frank_dimless_sigma_rad, aph_dimless_sigma_rad, rtol=1e-3)
+
+
+def test_jeans_integral_mpmath():
+    """ Compare the Jeans integral to values computed with mpmath quadrature
+    at 40 digits of precision, spanning each of the regimes used by the kernel.
+    """
+    y = np.array((0.01, 0.5, 1., 3., 10., 100., 1e4))
+    mpmath_result = np.array((1.5038768691956476, 0.082006144436883118,
+        0.023359850309723828, 0.0015649136819678735, 3.6677162467927242e-5,
+        9.5266812819731165e-9, 2.1147887120942384e-16))
+    assert np.allclose(_jeans_integral(y), mpmath_result, rtol=1e-10, atol=0)
+
+
+def test_unbiased_vel_rad_disp_halo_center():
+    result = unbiased_dimless_vel_rad_disp(np.array((0., 0.5)), 5)
+    assert result[0] == 0
+    assert np.all(np.isfinite(result))
+
+
+def test_unbiased_vel_rad_disp_large_conc():
+    result = unbiased_dimless_vel_rad_disp(np.array((0.5, 1.)), 5e4)
+    assert np.all(np.isfinite(result))
+    assert np.all(result > 0)
@@ -1,7 +1,7 @@
 """
 """
 import numpy as np
-from scipy.integrate import quad as quad_integration
+from scipy.special import spence
 
 from .mass_profile import _g_integral
 
@@ -9,16 +9,78 @@ from .mass_profile import _g_integral
 __all__ = ('dimensionless_radial_velocity_dispersion', )
 
 
-def _jeans_integrand_term1(y):
-    r"""
+# Above this value of y the Jeans integral is evaluated with its
+# asymptotic series in 1/y, since the closed-form terms cancel catastrophically
+_jeans_series_ymin = 10.
+_num_jeans_series_terms = 16
+
+
+def _jeans_series_coefficients(num_terms):
+    r""" Taylor coefficients in u = 1/t of :math:`(1+u)^{-2}` and of
+    :math:`(1+u)^{-2}\ln(1+u) - (1+u)^{-3}`.
     """
-    return np.log(1+y)/(y**3*(1+y)**2)
+    n = np.arange(num_terms)
+    inv_square_coeffs = (-1.)**n*(n + 1.)
+    inv_cube_coeffs = (-1.)**n*(n + 1.)*(n + 2.)/2.
+    log1p_coeffs = np.zeros(num_terms)
+    log1p_coeffs[1:] = (-1.)**(n[1:] + 1)/n[1:]
+    log_term_coeffs = np.convolve(log1p_coeffs, inv_square_coeffs)[:num_terms] - inv_cube_coeffs
+    return inv_square_coeffs, log_term_coeffs
 
 
-def _jeans_integrand_term2(y):
-    r"""
+_jeans_series_b, _jeans_series_a = _jeans_series_coefficients(_num_jeans_series_terms)
+
+
+def _jeans_integral_small_y(y):
+    r""" Closed form of the Jeans integral, Eq. (14) of
+    Lokas & Mamon (2001), arXiv:astro-ph/0002395, accurate for :math:`y < 1`.
+    """
+    log1py = np.log1p(y)
+    return 0.5*(np.pi**2 - np.log(y) - 1./y - 1./(1. + y)**2 - 6./(1. + y) +
+        (1. + 1./y**2 - 4./y - 2./(1. + y))*log1py +
+        3.*log1py**2 + 6.*spence(1. + y))
+
+
+def _jeans_integral_moderate_y(y):
+    r""" Closed form of the Jeans integral with the dilogarithm inverted,
+    :math:`{\rm Li}_{2}(-y) = -\pi^{2}/6 - \ln^{2}(y)/2 - {\rm Li}_{2}(-1/y)`,
+    accurate for :math:`1 <= y < 10`.
+    """
+    log1py = np.log1p(y)
+    log1p_inv_y = np.log1p(1./y)
+    return 0.5*(-6.*spence(1. + 1./y) +
+        3.*log1p_inv_y*(log1py + np.log(y)) + log1p_inv_y -
+        1./y - 1./(1. + y)**2 - 6./(1. + y) +
+        (1./y**2 - 4./y - 2./(1. + y))*log1py)
+
+
+def _jeans_integral_large_y(y):
+    r""" Asymptotic series of the Jeans integral in :math:`v = 1/y`, obtained by
+    integrating :math:`u^{3}[A(u) - B(u)\ln u]` term by term from 0 to v, where
+    :math:`B(u) = (1+u)^{-2}` and :math:`A(u) = B(u)\ln(1+u) - (1+u)^{-3}`.
+    """
+    v = 1./y[:, np.newaxis]
+    p = np.arange(_num_jeans_series_terms) + 4.
+    terms = v**p*(_jeans_series_a/p - _jeans_series_b*(np.log(v)/p - 1./p**2))
+    return np.sum(terms, axis=1)
+
+
+def _jeans_integral(y):
+    r""" Jeans integral :math:`\int_{y}^{\infty}{\rm d}t\frac{g(t)}{t^{3}(1 + t)^{2}}`
+    for strictly positive y, evaluated with whichever of the closed form,
+    the inverted closed form, or the asymptotic series is accurate for each element.
     """
-    return 1/(y**2*(1+y)**3)
+    y = np.atleast_1d(y).astype(np.float64)
+    result = np.zeros_like(y)
+
+    small = y < 1
+    large = y >= _jeans_series_ymin
+    moderate = ~small & ~large
+
+    result[small] = _jeans_integral_small_y(y[small])
+    result[moderate] = _jeans_integral_moderate_y(y[moderate])
+    result[large] = _jeans_integral_large_y(y[large])
+    return result
 
 
 def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
@@ -47,17 +109,12 @@ def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
         The returned result has the same dimension as the input ``scaled_radius``.
     """
     x = np.atleast_1d(scaled_radius).astype(np.float64)
-    result = np.zeros_like(x)
-
-    prefactor = conc*(conc*x)*(1. + conc*x)**2/_g_integral(conc)
 
-    lower_limit = conc*x
-    upper_limit = float("inf")
-    for i in range(len(x)):
-        term1, _ = quad_integration(_jeans_integrand_term1,
-            lower_limit[i], upper_limit, epsrel=1e-5)
-        term2, _ = quad_integration(_jeans_integrand_term2,
-            lower_limit[i], upper_limit, epsrel=1e-5)
-        result[i] = term1 - term2
+    y = conc*x
+    prefactor = conc*y*(1. + y)**2/_g_integral(conc)
 
-    return np.sqrt(result*prefactor)
+    # The dispersion vanishes at the halo center, where the integral diverges
+    result = np.zeros(np.shape(prefactor))
+    positive = y > 0
+    result[positive] = np.sqrt(prefactor[positive]*_jeans_integral(y[positive]))
+    return result
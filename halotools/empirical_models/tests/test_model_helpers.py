@@ -176,3 +176,20 @@ def test_call_func_table2():
 
 def test_call_func_table3():
     pass
+
+
+def test_call_func_table4():
+    """ Only a few entries of a large function table are requested.
+    """
+    num_conc_bins = 1000
+    f_table = list(_func_maker(i) for i in range(num_conc_bins))
+
+    num_abscissa = 7
+    cum_prob = np.array(list(0.1*i for i in range(num_abscissa)))
+
+    func_idx = np.array([999, 5, 999, 0, 5, 5, 999])
+    correct_result = cum_prob + func_idx
+
+    result = call_func_table(f_table, cum_prob, func_idx)
+
+    assert np.allclose(result, correct_result)
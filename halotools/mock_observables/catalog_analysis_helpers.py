@@ -214,12 +214,13 @@ def return_xyz_formatted_array(x, y, z, period=np.inf,
     if apply_distortion is True:
         try:
             assert vel_dist_dim in ('x', 'y', 'z')
-            spatial_distortion = (1. + redshift)*np.copy(velocity)/100./cosmology.efunc(redshift)
-            posdict[vel_dist_dim] = np.copy(posdict[vel_dist_dim]) + spatial_distortion
+            spatial_distortion = (1. + redshift)*velocity/100./cosmology.efunc(redshift)
+            posdict[vel_dist_dim] = np.add(
+                np.atleast_1d(posdict[vel_dist_dim]), spatial_distortion)
             Lbox = period_dict[vel_dist_dim]
             if Lbox != np.inf:
-                posdict[vel_dist_dim] = enforce_periodicity_of_box(
-                    posdict[vel_dist_dim], Lbox)
+                # posdict owns this array, so wrap it in place with a single pass
+                np.mod(posdict[vel_dist_dim], Lbox, out=posdict[vel_dist_dim])
         except AssertionError:
             msg = ("\nInput ``velocity_distortion_dimension`` must be either \n"
                 "``'x'``, ``'y'`` or ``'z'``.")
@@ -17,7 +17,7 @@ def _get_r_max(sample1, r_max):
     r_max = np.atleast_1d(r_max).astype(float)
 
     if len(r_max) == 1:
-        r_max = np.array([r_max[0]]*N1)
+        r_max = np.repeat(r_max, N1)
     else:
         try:
             assert len(r_max) == N1
@@ -132,19 +132,18 @@ def npairs_jackknife_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
         ifirst1 = cell1_indices[icell1]
         ilast1 = cell1_indices[icell1+1]
 
-        #extract the points in cell1
-        x_icell1 = x1[ifirst1:ilast1]
-        y_icell1 = y1[ifirst1:ilast1]
-        z_icell1 = z1[ifirst1:ilast1]
-
-        #extract the weights in cell1
-        w_icell1 = weights1[ifirst1:ilast1]
-
-        #extract the subvolume tags in cell1
-        j_icell1 = jtags1[ifirst1:ilast1]
-
         Ni = ilast1 - ifirst1
         if Ni > 0:
+            #extract the points in cell1
+            x_icell1 = x1[ifirst1:ilast1]
+            y_icell1 = y1[ifirst1:ilast1]
+            z_icell1 = z1[ifirst1:ilast1]
+
+            #extract the weights in cell1
+            w_icell1 = weights1[ifirst1:ilast1]
+
+            #extract the subvolume tags in cell1
+            j_icell1 = jtags1[ifirst1:ilast1]
 
             ix1 = icell1 // (num_y1divs*num_z1divs)
             iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
@@ -192,20 +191,20 @@ def npairs_jackknife_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                         ifirst2 = cell2_indices[icell2]
                         ilast2 = cell2_indices[icell2+1]
 
-                        #extract the points in cell2
-                        x_icell2 = x2[ifirst2:ilast2]
-                        y_icell2 = y2[ifirst2:ilast2]
-                        z_icell2 = z2[ifirst2:ilast2]
+                        Nj = ilast2 - ifirst2
+                        if Nj > 0:
+                            #extract the points in cell2
+                            x_icell2 = x2[ifirst2:ilast2]
+                            y_icell2 = y2[ifirst2:ilast2]
+                            z_icell2 = z2[ifirst2:ilast2]
 
-                        #extract the weights in cell1
-                        w_icell2 = weights2[ifirst2:ilast2]
+                            #extract the weights in cell1
+                            w_icell2 = weights2[ifirst2:ilast2]
 
-                        #extract the subvolume tags in cell1
-                        j_icell2 = jtags2[ifirst2:ilast2]
+                            #extract the subvolume tags in cell1
+                            j_icell2 = jtags2[ifirst2:ilast2]
 
-                        Nj = ilast2 - ifirst2
-                        #loop over points in cell1
-                        if Nj > 0:
+                            #loop over points in cell1
                             for i in range(0,Ni):
                                 x1tmp = x_icell1[i] - x2shift
                                 y1tmp = y_icell1[i] - y2shift
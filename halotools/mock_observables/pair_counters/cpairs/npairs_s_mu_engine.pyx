@@ -123,12 +123,12 @@ def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     for icell1 in range(first_cell1_element, last_cell1_element):
         ifirst1 = cell1_indices[icell1]
         ilast1 = cell1_indices[icell1+1]
-        x_icell1 = x1[ifirst1:ilast1]
-        y_icell1 = y1[ifirst1:ilast1]
-        z_icell1 = z1[ifirst1:ilast1]
 
         Ni = ilast1 - ifirst1
         if Ni > 0:
+            x_icell1 = x1[ifirst1:ilast1]
+            y_icell1 = y1[ifirst1:ilast1]
+            z_icell1 = z1[ifirst1:ilast1]
 
             ix1 = icell1 // (num_y1divs*num_z1divs)
             iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
@@ -176,13 +176,13 @@ def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                         ifirst2 = cell2_indices[icell2]
                         ilast2 = cell2_indices[icell2+1]
 
-                        x_icell2 = x2[ifirst2:ilast2]
-                        y_icell2 = y2[ifirst2:ilast2]
-                        z_icell2 = z2[ifirst2:ilast2]
-
                         Nj = ilast2 - ifirst2
-                        # loop over points in cell1 points
                         if Nj > 0:
+                            x_icell2 = x2[ifirst2:ilast2]
+                            y_icell2 = y2[ifirst2:ilast2]
+                            z_icell2 = z2[ifirst2:ilast2]
+
+                            # loop over points in cell1 points
                             for i in range(0,Ni):
                                 x1tmp = x_icell1[i] - x2shift
                                 y1tmp = y_icell1[i] - y2shift
@@ -58,144 +58,183 @@ def pairwise_distance_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
     cdef int PBCs = double_mesh._PBCs
 
-    cdef int Ncell1 = double_mesh.mesh1.ncells
+    mesh1, mesh2 = double_mesh.mesh1, double_mesh.mesh2
+    idx_sorted1, idx_sorted2 = mesh1.idx_sorted, mesh2.idx_sorted
+
+    cdef int Ncell1 = mesh1.ncells
 
     rmax = rmax*rmax
-    cdef cnp.float64_t[:] rmax_squared = np.ascontiguousarray(rmax[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] rmax_squared = np.ascontiguousarray(rmax[idx_sorted1], dtype=np.float64)
 
-    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
-    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[idx_sorted1], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[idx_sorted1], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[idx_sorted1], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[idx_sorted2], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[idx_sorted2], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[idx_sorted2], dtype=np.float64)
 
     cdef vector[cnp.int_t] i_ind
     cdef vector[cnp.int_t] j_ind
     cdef vector[cnp.float64_t] distances
 
     cdef cnp.int64_t icell1, icell2
-    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
-    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(mesh2.cell_id_indices, dtype=np.int64)
 
     cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2
 
     cdef int ix2, iy2, iz2, ix1, iy1, iz1
-    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2, last_nonPBC_iz2
 
     cdef int num_x2_covering_steps = int(np.ceil(
-        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+        double_mesh.search_xlength / mesh2.xcell_size))
     cdef int num_y2_covering_steps = int(np.ceil(
-        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+        double_mesh.search_ylength / mesh2.ycell_size))
     cdef int num_z2_covering_steps = int(np.ceil(
-        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+        double_mesh.search_zlength / mesh2.zcell_size))
 
     cdef int leftmost_ix2, rightmost_ix2
     cdef int leftmost_iy2, rightmost_iy2
     cdef int leftmost_iz2, rightmost_iz2
 
-    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
-    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
-    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
-    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
-    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
-    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x1divs = mesh1.num_xdivs
+    cdef int num_y1divs = mesh1.num_ydivs
+    cdef int num_z1divs = mesh1.num_zdivs
+    cdef int num_x2divs = mesh2.num_xdivs
+    cdef int num_y2divs = mesh2.num_ydivs
+    cdef int num_z2divs = mesh2.num_zdivs
     cdef int num_x2_per_x1 = num_x2divs // num_x1divs
     cdef int num_y2_per_y1 = num_y2divs // num_y1divs
     cdef int num_z2_per_z1 = num_z2divs // num_z1divs
 
     cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dsq
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp
-    cdef int Ni, Nj, i, j, k, l
-
-    cdef cnp.float64_t[:] x_icell1, x_icell2
-    cdef cnp.float64_t[:] y_icell1, y_icell2
-    cdef cnp.float64_t[:] z_icell1, z_icell2
-
-    for icell1 in range(first_cell1_element, last_cell1_element):
-        ifirst1 = cell1_indices[icell1]
-        ilast1 = cell1_indices[icell1+1]
-        x_icell1 = x1[ifirst1:ilast1]
-        y_icell1 = y1[ifirst1:ilast1]
-        z_icell1 = z1[ifirst1:ilast1]
-
-        Ni = ilast1 - ifirst1
-        if Ni > 0:
-
-            ix1 = icell1 // (num_y1divs*num_z1divs)
-            iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
-            iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
-
-            leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
-            leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
-            leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
-
-            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
-            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
-            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
-
-            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
-                if nonPBC_ix2 < 0:
-                    x2shift = -xperiod*PBCs
-                elif nonPBC_ix2 >= num_x2divs:
-                    x2shift = +xperiod*PBCs
-                else:
-                    x2shift = 0.
-                # Now apply the PBCs
-                ix2 = nonPBC_ix2 % num_x2divs
-
-                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
-                    if nonPBC_iy2 < 0:
-                        y2shift = -yperiod*PBCs
-                    elif nonPBC_iy2 >= num_y2divs:
-                        y2shift = +yperiod*PBCs
+    cdef int Ni, Nj, i, k, l
+    cdef cnp.int64_t j, jfirst, jlast
+    # 512 points of x2, y2, z2 occupy 12kB, comfortably within L1
+    cdef cnp.int64_t jblock_size = 512
+
+    cdef cnp.float64_t[:] x_icell1
+    cdef cnp.float64_t[:] y_icell1
+    cdef cnp.float64_t[:] z_icell1
+
+    # the cell traversal touches only C-level data, so release the GIL
+    with nogil:
+        for icell1 in range(first_cell1_element, last_cell1_element):
+            ifirst1 = cell1_indices[icell1]
+            ilast1 = cell1_indices[icell1+1]
+
+            Ni = ilast1 - ifirst1
+            if Ni > 0:
+                x_icell1 = x1[ifirst1:ilast1]
+                y_icell1 = y1[ifirst1:ilast1]
+                z_icell1 = z1[ifirst1:ilast1]
+
+                ix1 = icell1 // (num_y1divs*num_z1divs)
+                iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+                iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+                leftmost_ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps
+                leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
+                leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
+
+                rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
+                rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
+                rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
+
+                for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+                    if nonPBC_ix2 < 0:
+                        x2shift = -xperiod*PBCs
+                    elif nonPBC_ix2 >= num_x2divs:
+                        x2shift = +xperiod*PBCs
                     else:
-                        y2shift = 0.
+                        x2shift = 0.
                     # Now apply the PBCs
-                    iy2 = nonPBC_iy2 % num_y2divs
+                    ix2 = nonPBC_ix2 % num_x2divs
 
-                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
-                        if nonPBC_iz2 < 0:
-                            z2shift = -zperiod*PBCs
-                        elif nonPBC_iz2 >= num_z2divs:
-                            z2shift = +zperiod*PBCs
+                    for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
+                        if nonPBC_iy2 < 0:
+                            y2shift = -yperiod*PBCs
+                        elif nonPBC_iy2 >= num_y2divs:
+                            y2shift = +yperiod*PBCs
                         else:
-                            z2shift = 0.
+                            y2shift = 0.
                         # Now apply the PBCs
-                        iz2 = nonPBC_iz2 % num_z2divs
-
-                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
-                        ifirst2 = cell2_indices[icell2]
-                        ilast2 = cell2_indices[icell2+1]
-
-                        x_icell2 = x2[ifirst2:ilast2]
-                        y_icell2 = y2[ifirst2:ilast2]
-                        z_icell2 = z2[ifirst2:ilast2]
-
-                        Nj = ilast2 - ifirst2
-                        #loop over points in cell1 points
-                        if Nj > 0:
-                            for i in range(0,Ni):
-                                x1tmp = x_icell1[i] - x2shift
-                                y1tmp = y_icell1[i] - y2shift
-                                z1tmp = z_icell1[i] - z2shift
-                                #loop over points in cell2 points
-                                for j in range(0,Nj):
-                                    #calculate the square distance
-                                    dx = x1tmp - x_icell2[j]
-                                    dy = y1tmp - y_icell2[j]
-                                    dz = z1tmp - z_icell2[j]
-                                    dsq = dx*dx + dy*dy + dz*dz
-
-                                    if dsq <= rmax_squared[ifirst1+i]:
-                                        distances.push_back(dsq)
-                                        i_ind.push_back(ifirst1 + i)
-                                        j_ind.push_back(ifirst2 + j)
+                        iy2 = nonPBC_iy2 % num_y2divs
+
+                        nonPBC_iz2 = leftmost_iz2
+                        while nonPBC_iz2 < rightmost_iz2:
+                            if nonPBC_iz2 < 0:
+                                z2shift = -zperiod*PBCs
+                            elif nonPBC_iz2 >= num_z2divs:
+                                z2shift = +zperiod*PBCs
+                            else:
+                                z2shift = 0.
+                            # Now apply the PBCs
+                            iz2 = nonPBC_iz2 % num_z2divs
+
+                            # Cells with consecutive iz2 are adjacent in the sorted arrays,
+                            # so every cell2 up to the next periodic boundary in z
+                            # shares the same z2shift and is handled as a single block
+                            last_nonPBC_iz2 = min(rightmost_iz2,
+                                (nonPBC_iz2 // num_z2divs + 1)*num_z2divs)
+
+                            icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                            ifirst2 = cell2_indices[icell2]
+                            ilast2 = cell2_indices[icell2 + last_nonPBC_iz2 - nonPBC_iz2]
+                            nonPBC_iz2 = last_nonPBC_iz2
+
+                            Nj = ilast2 - ifirst2
+                            #loop over points in cell1 points
+                            if Nj > 0:
+                                #tile the cell2 points so that each block of x2, y2, z2
+                                #stays in cache while every cell1 point is compared to it
+                                jfirst = ifirst2
+                                while jfirst < ilast2:
+                                    jlast = min(jfirst + jblock_size, ilast2)
+                                    for i in range(0,Ni):
+                                        x1tmp = x_icell1[i] - x2shift
+                                        y1tmp = y_icell1[i] - y2shift
+                                        z1tmp = z_icell1[i] - z2shift
+                                        #loop over points in cell2 points, reading the sorted
+                                        #arrays directly rather than slicing out each cell2
+                                        for j in range(jfirst,jlast):
+                                            #calculate the square distance
+                                            dx = x1tmp - x2[j]
+                                            dy = y1tmp - y2[j]
+                                            dz = z1tmp - z2[j]
+                                            dsq = dx*dx + dy*dy + dz*dz
+
+                                            if dsq <= rmax_squared[ifirst1+i]:
+                                                distances.push_back(dsq)
+                                                i_ind.push_back(ifirst1 + i)
+                                                j_ind.push_back(j)
+                                    jfirst = jlast
+
+    #copy the accepted pairs into arrays allocated once at their final size
+    cdef cnp.int64_t npairs = distances.size()
+    cdef cnp.int64_t ipair
+    dist = np.empty(npairs, dtype=np.float64)
+    i_sorted = np.empty(npairs, dtype=np.int64)
+    j_sorted = np.empty(npairs, dtype=np.int64)
+    cdef cnp.float64_t[:] dist_view = dist
+    cdef cnp.int64_t[:] i_view = i_sorted
+    cdef cnp.int64_t[:] j_view = j_sorted
+    for ipair in range(npairs):
+        dist_view[ipair] = distances[ipair]
+        i_view[ipair] = i_ind[ipair]
+        j_view[ipair] = j_ind[ipair]
+
+    #take a single square root over the accepted pairs only
+    np.sqrt(dist, out=dist)
 
     #input points were sorted.  return the indices of the unsorted arrays
-    i_ind = np.array(i_ind).astype(int)
-    i_ind = double_mesh.mesh1.idx_sorted[i_ind]
-    j_ind = np.array(j_ind).astype(int)
-    j_ind = double_mesh.mesh2.idx_sorted[j_ind]
-
-    return (np.sqrt(distances).astype(float), i_ind, j_ind)
+    #gather straight into int32 when every index fits, since this is the
+    #index type coo_matrix would otherwise convert to with an extra copy
+    if max(len(idx_sorted1), len(idx_sorted2)) <= np.iinfo(np.int32).max:
+        index_dtype = np.int32
+    else:
+        index_dtype = np.int64
+    i_inds = np.take(idx_sorted1, i_sorted, out=np.empty(npairs, dtype=index_dtype), mode='clip')
+    j_inds = np.take(idx_sorted2, j_sorted, out=np.empty(npairs, dtype=index_dtype), mode='clip')
+    return (dist, i_inds, j_inds)
@@ -167,7 +167,7 @@ def _npairs_xy_z_process_args(sample1, sample2, rp_bins, pi_bins, period,
         num_threads, approx_cell1_size, approx_cell2_size):
     """
     """
-    if num_threads is not 1:
+    if num_threads != 1:
         if num_threads == 'max':
             num_threads = multiprocessing.cpu_count()
         if not isinstance(num_threads, int):
@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import numpy as np
 import multiprocessing
+from multiprocessing.pool import ThreadPool
 from functools import partial
 from scipy.sparse import coo_matrix
 
@@ -64,7 +65,7 @@ def pairwise_distance_3d(data1, data2, r_max, period=None,
         Number of CPU cores to use in the pair counting.
         If ``num_threads`` is set to the string 'max', use all available cores.
         Default is 1 thread for a serial calculation that
-        does not open a multiprocessing pool.
+        does not open a thread pool.
 
     approx_cell1_size : array_like, optional
         Length-3 array serving as a guess for the optimal manner by which
@@ -143,23 +144,23 @@ def pairwise_distance_3d(data1, data2, r_max, period=None,
     num_threads, cell1_tuples = _cell1_parallelization_indices(
         double_mesh.mesh1.ncells, num_threads)
 
+    # The engine releases the GIL while traversing the mesh, so threads
+    # share double_mesh and the point arrays instead of pickling them
     if num_threads > 1:
-        pool = multiprocessing.Pool(num_threads)
+        pool = ThreadPool(num_threads)
         result = pool.map(engine, cell1_tuples)
         pool.close()
     else:
         result = [engine(cell1_tuples[0])]
 
-    # unpack result
-    d = np.zeros((0,), dtype='float')
-    i_inds = np.zeros((0,), dtype='int')
-    j_inds = np.zeros((0,), dtype='int')
-
-    # unpack the results
-    for i in range(len(result)):
-        d = np.append(d, result[i][0])
-        i_inds = np.append(i_inds, result[i][1])
-        j_inds = np.append(j_inds, result[i][2])
+    # unpack the results with a single concatenation per output array,
+    # using the engine output directly when there is nothing to join
+    if len(result) == 1:
+        d, i_inds, j_inds = result[0]
+    else:
+        d = np.concatenate([r[0] for r in result])
+        i_inds = np.concatenate([r[1] for r in result])
+        j_inds = np.concatenate([r[2] for r in result])
 
     return coo_matrix((d, (i_inds, j_inds)), shape=(len(data1), len(data2)))
 
@@ -169,7 +170,7 @@ def _pairwise_distance_3d_process_args(data1, data2, r_max, period,
     """
     helper function to process arguments for `~halotools.mock_observables.pairwise_distance_3d function.
     """
-    if num_threads is not 1:
+    if num_threads != 1:
         if num_threads == 'max':
             num_threads = multiprocessing.cpu_count()
         if not isinstance(num_threads, int):
@@ -228,7 +229,7 @@ def _get_r_max(sample1, r_max):
     r_max = np.atleast_1d(r_max).astype(float)
 
     if len(r_max) == 1:
-        r_max = np.array([r_max[0]]*N1)
+        r_max = np.repeat(r_max, N1)
     else:
         try:
             assert len(r_max) == N1
@@ -19,34 +19,15 @@ def pure_python_distance_matrix_3d(
     else:
         xperiod, yperiod, zperiod = Lbox, Lbox, Lbox
 
-    npts1, npts2 = len(sample1), len(sample2)
+    dx = _periodic_separation(sample1[:, 0], sample2[:, 0], xperiod)
+    dy = _periodic_separation(sample1[:, 1], sample2[:, 1], yperiod)
+    dz = _periodic_separation(sample1[:, 2], sample2[:, 2], zperiod)
 
-    pair_matrix = np.zeros((npts1, npts2))
+    rsq = dx*dx + dy*dy + dz*dz
+    mask = rsq <= r_max*r_max
 
-    for i in range(npts1):
-        for j in range(npts2):
-            dx = sample1[i, 0] - sample2[j, 0]
-            dy = sample1[i, 1] - sample2[j, 1]
-            dz = sample1[i, 2] - sample2[j, 2]
-
-            if dx > xperiod/2.:
-                dx = xperiod - dx
-            elif dx < -xperiod/2.:
-                dx = -(xperiod + dx)
-
-            if dy > yperiod/2.:
-                dy = yperiod - dy
-            elif dy < -yperiod/2.:
-                dy = -(yperiod + dy)
-
-            if dz > zperiod/2.:
-                dz = zperiod - dz
-            elif dz < -zperiod/2.:
-                dz = -(zperiod + dz)
-
-            r = np.sqrt(dx*dx + dy*dy + dz*dz)
-            if r <= r_max:
-                pair_matrix[i, j] = r
+    pair_matrix = np.zeros(rsq.shape)
+    pair_matrix[mask] = np.sqrt(rsq[mask])
 
     return pair_matrix
 
@@ -63,36 +44,26 @@ def pure_python_distance_matrix_xy_z(
     else:
         xperiod, yperiod, zperiod = Lbox, Lbox, Lbox
 
-    npts1, npts2 = len(sample1), len(sample2)
-
-    pair_matrix_xy = np.zeros((npts1, npts2))
-    pair_matrix_z = np.zeros((npts1, npts2))
+    dx = _periodic_separation(sample1[:, 0], sample2[:, 0], xperiod)
+    dy = _periodic_separation(sample1[:, 1], sample2[:, 1], yperiod)
+    dz = np.abs(_periodic_separation(sample1[:, 2], sample2[:, 2], zperiod))
 
-    for i in range(npts1):
-        for j in range(npts2):
-            dx = sample1[i, 0] - sample2[j, 0]
-            dy = sample1[i, 1] - sample2[j, 1]
-            dz = sample1[i, 2] - sample2[j, 2]
+    rpsq = dx*dx + dy*dy
+    mask = (rpsq <= rp_max*rp_max) & (dz <= pi_max)
 
-            if dx > xperiod/2.:
-                dx = xperiod - dx
-            elif dx < -xperiod/2.:
-                dx = -(xperiod + dx)
+    pair_matrix_xy = np.zeros(rpsq.shape)
+    pair_matrix_z = np.zeros(rpsq.shape)
+    pair_matrix_xy[mask] = np.sqrt(rpsq[mask])
+    pair_matrix_z[mask] = dz[mask]
 
-            if dy > yperiod/2.:
-                dy = yperiod - dy
-            elif dy < -yperiod/2.:
-                dy = -(yperiod + dy)
-
-            if dz > zperiod/2.:
-                dz = zperiod - dz
-            elif dz < -zperiod/2.:
-                dz = -(zperiod + dz)
+    return pair_matrix_xy, pair_matrix_z
 
-            rp = np.sqrt(dx*dx + dy*dy)
-            dz = abs(dz)
-            if (rp <= rp_max) & (dz <= pi_max):
-                pair_matrix_xy[i, j] = rp
-                pair_matrix_z[i, j] = dz
 
-    return pair_matrix_xy, pair_matrix_z
+def _periodic_separation(x1, x2, period):
+    """ Return the Npts1 x Npts2 matrix of separations x1[i] - x2[j],
+    with each entry mapped onto its nearest periodic image.
+    """
+    d = np.subtract.outer(x1, x2)
+    d = np.where(d > period/2., period - d, d)
+    d = np.where(d < -period/2., -(period + d), d)
+    return d
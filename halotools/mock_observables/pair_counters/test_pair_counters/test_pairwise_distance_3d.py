@@ -218,6 +218,45 @@ def test_xy_z_brute_force_elementwise_comparison():
             assert np.allclose(brute_force_element, sparse_matrix_element, rtol=0.001)
 
 
+def test_xy_z_distinct_rp_max_pi_max():
+    """ Verify that ``pi_max`` sets the z-search length independently of ``rp_max``.
+    """
+    Npts1, Npts2 = int(1e2), int(1e2)
+
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+
+    for rp_max, pi_max in ((0.1, 0.3), (0.3, 0.1)):
+        sparse_matrix_xy, sparse_matrix_z = pairwise_distance_xy_z(
+            sample1, sample2, rp_max, pi_max, period=1)
+
+        pure_python_dense_matrix_xy, pure_python_dense_matrix_z = pure_python_distance_matrix_xy_z(
+            sample1, sample2, rp_max, pi_max, Lbox=1)
+
+        assert sparse_matrix_z.getnnz() == np.count_nonzero(pure_python_dense_matrix_z)
+        assert np.all(sparse_matrix_z.data <= pi_max)
+        assert np.all(sparse_matrix_xy.data <= rp_max)
+        assert np.allclose(sparse_matrix_z.toarray(), pure_python_dense_matrix_z)
+
+
+def test_xy_z_shared_pair_indices():
+    """ Verify that the two returned matrices share their row and column arrays.
+    """
+    Npts1, Npts2 = int(1e2), int(1e2)
+
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((Npts1, 3))
+        sample2 = np.random.random((Npts2, 3))
+
+    sparse_matrix_xy, sparse_matrix_z = pairwise_distance_xy_z(
+        sample1, sample2, 0.2, 0.2, period=1)
+
+    assert sparse_matrix_xy.getnnz() > 0
+    assert np.shares_memory(sparse_matrix_xy.row, sparse_matrix_z.row)
+    assert np.shares_memory(sparse_matrix_xy.col, sparse_matrix_z.col)
+
+
 def test_get_rmax1():
     """
     """
@@ -307,6 +307,14 @@ def test_return_xyz_formatted_array4():
     assert np.allclose(result1[:, 0], result2)
 
 
+def test_return_xyz_formatted_array5():
+    """ Verify that scalar inputs are wrapped into the box
+    """
+    result = cat_helpers.return_xyz_formatted_array(1., 2., 3., period=5.,
+        velocity=300., velocity_distortion_dimension='z')
+    assert np.allclose(result, [[1., 2., 1.]])
+
+
 class TestCatalogAnalysisHelpers(TestCase):
     """ Class providing tests of the `~halotools.mock_observables.catalog_analysis_helpers`.
     """
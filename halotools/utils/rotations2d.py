@@ -49,7 +49,7 @@ def rotation_matrices_from_angles(angles):
     sina = np.sin(angles)
     cosa = np.cos(angles)
 
-    R = np.zeros((npts, 2, 2))
+    R = np.empty((npts, 2, 2))
     R[:, 0, 0] = cosa
     R[:, 1, 1] = cosa
 
@@ -166,7 +166,7 @@ def rotation_matrices_from_basis(ux, uy, tol=np.pi/1000.0):
     r_21 = elementwise_dot(ey, ux)
     r_22 = elementwise_dot(ey, uy)
 
-    r = np.zeros((N, 2, 2))
+    r = np.empty((N, 2, 2))
     r[:,0,0] = r_11
     r[:,0,1] = r_12
     r[:,1,0] = r_21
@@ -211,7 +211,7 @@ def rotation_matrices_from_basis(ux, uy, uz, tol=np.pi/1000.0):
     r_32 = elementwise_dot(ez, uy)
     r_33 = elementwise_dot(ez, uz)
 
-    r = np.zeros((N, 3, 3))
+    r = np.empty((N, 3, 3))
     r[:,0,0] = r_11
     r[:,0,1] = r_12
     r[:,0,2] = r_13